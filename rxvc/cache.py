@@ -1,13 +1,19 @@
 """Functions for working with our receiver cache."""
 import sys
 import json
+import time
 from pathlib import Path
 from os.path import expanduser
-from rxv import RXV
-import rxv
 
 cache_path = Path(expanduser("~/.rxvc_cache"))
 
+# Parsed contents of cache_path, loaded on first use.
+_parsed_cache = None
+
+# Seconds a cached receiver capability is used before it's fetched
+# again, so firmware or configuration changes get picked up.
+CAPABILITY_TTL = 7 * 24 * 60 * 60
+
 
 def find_receiver():
     """Look for a receiver using rxv's find method. If no receiver
@@ -15,6 +21,8 @@ def find_receiver():
     (if multiple are found) receiver
 
     """
+    import rxv
+
     receiver = None
     print("Looking for receivers...")
     found_receivers = rxv.find()
@@ -32,17 +40,38 @@ def find_receiver():
     return receiver
 
 
+def _read_cache():
+    """Return the parsed contents of our cache file, or an empty
+    dict if there isn't one. The file is only read once per run,
+    later calls get the already parsed copy.
+
+    """
+    global _parsed_cache
+    if _parsed_cache is None:
+        try:
+            _parsed_cache = json.loads(cache_path.read_text())
+        except FileNotFoundError:
+            _parsed_cache = {}
+    return _parsed_cache
+
+
+def _write_cache(parsed_cache):
+    """Dump parsed_cache to json into our cache file."""
+    global _parsed_cache
+    _parsed_cache = parsed_cache
+    cache_path.write_text(json.dumps(parsed_cache))
+
+
 def cache_receiver(receiver):
-    """Touch our cache file to make sure it at least exists and
-    dump what we know (control url, name, model) to json into
-    the file as a cache for the next run of this project.
+    """Dump what we know about the receiver (control url, name,
+    model) to json into our cache file as a cache for the next
+    run of this project.
 
     """
-    cache_path.touch(exist_ok=True)
-    cache_path.write_text(json.dumps({
+    _write_cache({
         'ctrl_url': receiver.ctrl_url,
         'friendly_name': receiver.friendly_name,
-        'model_name': receiver.model_name}))
+        'model_name': receiver.model_name})
 
 
 def cached_receiver():
@@ -51,14 +80,62 @@ def cached_receiver():
     on the next run of rxvc.
 
     """
-    if cache_path.exists():
-        parsed_cache = json.loads(cache_path.read_text())
+    parsed_cache = _read_cache()
+    if 'ctrl_url' in parsed_cache:
+        from rxv import RXV
+
         return RXV(parsed_cache['ctrl_url'],
                    friendly_name=parsed_cache['friendly_name'],
                    model_name=parsed_cache['model_name'])
 
 
+def cached_capability(avr, name):
+    """Return the receiver's inputs, surround programs, zones or
+    scenes, as returned by the rxv method called name. These are
+    effectively constant but each one costs a round trip to the
+    receiver, so they're fetched the first time they're needed and
+    stored in the cache file alongside the receiver itself.
+
+    A cached value is also put in the RXV object's own cache for it,
+    where this version of rxv has one, so the rxv setters validating
+    against it don't fetch it again.
+
+    Each value is stored with the time it was fetched and is fetched
+    again once it's older than CAPABILITY_TTL.
+
+    """
+    parsed_cache = _read_cache()
+    caps = parsed_cache.setdefault('capabilities', {})
+    cached = caps.get(name)
+    if cached is not None and time.time() - cached['fetched'] < CAPABILITY_TTL:
+        # rxv memoizes these per object in _inputs_cache,
+        # _surround_programs_cache, _zones_cache and _scenes_cache,
+        # though older versions (like 0.1.7) only have _inputs_cache.
+        attr = '_{}_cache'.format(name)
+        if hasattr(avr, attr):
+            setattr(avr, attr, cached['value'])
+        return cached['value']
+
+    value = getattr(avr, name)()
+    caps[name] = {'fetched': time.time(), 'value': value}
+    _write_cache(parsed_cache)
+    return value
+
+
+def clear_capabilities():
+    """Drop the cached receiver capabilities, keeping the cached
+    receiver itself.
+
+    """
+    parsed_cache = _read_cache()
+    if 'capabilities' in parsed_cache:
+        del parsed_cache['capabilities']
+        _write_cache(parsed_cache)
+
+
 def clear():
     """Clear the receiver cache if it exists."""
+    global _parsed_cache
+    _parsed_cache = None
     if cache_path.exists():
         cache_path.unlink()
@@ -0,0 +1,7 @@
+"""Subcommands of the rxvc command line interface, grouped into
+modules that are only imported when one of their commands runs.
+
+"""
+CTX_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+ON_OFF = frozenset(('on', 'off'))
@@ -0,0 +1,78 @@
+"""Commands for selecting receiver inputs and outputs."""
+import click
+
+import rxvc.cache as cache
+from rxvc.commands import CTX_SETTINGS, ON_OFF
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.pass_context
+def inputs(ctx):
+    """List valid input names for this receiver.
+
+    These are names that can also be passed to the input command
+    when using it to set an input.
+
+    """
+    for input in sorted(cache.cached_capability(ctx.obj['avr'], 'inputs')):
+        print('* ', input)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument("input", nargs=-1)
+@click.pass_context
+def input(ctx, input):
+    """See the current receiver input or set it if passed an
+    argument that is a valid input for the receiver. Note that
+    if it has spaces in it, you should wrap the whole argument
+    in quotes.
+
+    """
+    avr = ctx.obj['avr']
+    if input:
+        if input[0] in cache.cached_capability(avr, 'inputs'):
+            print("Setting receiver input to {}".format(input[0]))
+            avr.input = input[0]
+        else:
+            print(("That's not a valid input. Run `rxvc inputs' to"
+                   "get a list of them."))
+    else:
+        print("Current input is", avr.input)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument("output", required=True)
+@click.argument("state", required=True)
+@click.pass_context
+def output(ctx, output, state):
+    """Set the outputs of the receiver on or off.
+
+    """
+    avr = ctx.obj['avr']
+    if state in ON_OFF:
+        if (state == 'on'): outstate = True
+        if (state == 'off'): outstate = False
+        if output in avr.outputs:
+            print("Setting receiver output {0} to {1}".format(output, state))
+            avr.enable_output(output, outstate)
+        else:
+            print(("That's not a valid output. Run `rxvc outputs' to"
+                   "get a list of them."))
+    else:
+        click.echo(
+            click.style("State must be on or off", fg='red')
+        )
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.pass_context
+def outputs(ctx):
+    """List valid output names for this receiver.
+
+    These are names that can also be passed to the output command
+    when using it to set an output to a state.
+
+    """
+    avr = ctx.obj['avr']
+    for output in sorted(avr.outputs.items()):
+        print('* {0}: {1}'.format(output[0], output[1]))
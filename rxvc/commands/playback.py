@@ -0,0 +1,97 @@
+"""Commands for playback and menu control of the active input."""
+import sys
+import click
+
+from rxvc.commands import CTX_SETTINGS
+
+# Map playback and menu command names to the RXV methods they call.
+PLAYBACK_COMMANDS = {
+    'play': 'play',
+    'stop': 'stop',
+    'pause': 'pause',
+    'next': 'next',
+    'previous': 'previous'}
+
+MENU_COMMANDS = {
+    'up': 'menu_up',
+    'down': 'menu_down',
+    'left': 'menu_left',
+    'right': 'menu_right',
+    'select': 'menu_sel',
+    'return': 'menu_return'}
+
+PLAY_STATUS_TEMPLATE = ("\nPlaying: %s\n"
+                        "Artist: %s\n"
+                        "Album: %s\n"
+                        "Track: %s\n"
+                        "Station: %s\n\n")
+
+MENU_STATUS_TEMPLATE = ("\nReady: %s\n"
+                        "Layer: %s\n"
+                        "Name: %s\n\n"
+                        "Total lines: %s\n")
+
+MENU_LINE_TEMPLATE = "*  %s"
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument("command", required=False)
+@click.pass_context
+def playback(ctx, command):
+    """See the current receiver playback status or pass a command to it.
+
+    """
+    avr = ctx.obj['avr']
+    if not avr.is_playback_supported():
+        print("Playback controls are not available for the active input.")
+        return
+
+    if command:
+        if command in PLAYBACK_COMMANDS:
+            print("Sending command {} to receiver".format(command))
+            getattr(avr, PLAYBACK_COMMANDS[command])()
+        else:
+            print(("That's not a valid playback control command. Valid commands"
+                   "include 'play', 'stop', 'pause', 'next' and 'previous'."))
+    else:
+        status = avr.play_status()
+        sys.stdout.write(PLAY_STATUS_TEMPLATE % (
+            status.playing, status.artist, status.album, status.song,
+            status.station))
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument("command", required=False)
+@click.pass_context
+def menu(ctx, command):
+    """See the current receiver menu status or operate it.
+
+    """
+    avr = ctx.obj['avr']
+    status = avr.menu_status()
+    if not status.ready:
+        print("Menu is currently not available.")
+        return
+
+    if command:
+        if command in MENU_COMMANDS:
+            print("Sending menu command {} to receiver".format(command))
+            getattr(avr, MENU_COMMANDS[command])()
+        else:
+            print(("That's not a valid menu control command. Valid commands "
+                   "include 'up', 'down', 'left', 'right', 'select' and 'return'."))
+            return
+
+        # The command changes what the menu shows, so fetch it again.
+        status = avr.menu_status()
+
+    lines = [MENU_STATUS_TEMPLATE % (
+        status.ready, status.layer, status.name, status.max_line)]
+
+    # print lines as displayed in the web interface, ordered by their
+    # Line_N keys since dicts don't keep insertion order on Python 3.5
+    current_list = status.current_list
+    for line in sorted(current_list):
+        lines.append(MENU_LINE_TEMPLATE % current_list[line])
+
+    sys.stdout.write("\n".join(lines) + "\n")
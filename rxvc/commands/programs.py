@@ -0,0 +1,110 @@
+"""Commands for receiver surround programs, zones and scenes."""
+import click
+
+import rxvc.cache as cache
+from rxvc.commands import CTX_SETTINGS
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument("sp", required=False)
+@click.pass_context
+def sp(ctx, sp):
+    """See the current receiver surround program or set it if
+    passed an argument that is a valid input for the receiver.
+    Note that if it has spaces in it, you should wrap the whole
+    argument in quotes.
+
+    """
+    avr = ctx.obj['avr']
+    if sp:
+        if sp in cache.cached_capability(avr, 'surround_programs'):
+            print("Setting receiver surround program to {}".format(sp))
+            avr.surround_program = sp
+        else:
+            print(("That's not a valid surround program. Run `rxvc sps'"
+                   "to get a list of them."))
+    else:
+        print(avr.surround_program)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.pass_context
+def sps(ctx):
+    """List valid surround program names for this receiver.
+
+    These are names that can also be passed to the sp command
+    when using it to select a surround program.
+
+    """
+    print("Valid surround programs for this receiver are:")
+    sps = cache.cached_capability(ctx.obj['avr'], 'surround_programs')
+    for sp in sorted(sps):
+        print('* ', sp)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument("zone", required=False)
+@click.pass_context
+def zone(ctx, zone):
+    """See the current receiver zone or set it if passed an
+    argument that is a valid zone for the receiver. Note that
+    if it has spaces in it, you should wrap the whole
+    argument in quotes.
+
+    """
+    avr = ctx.obj['avr']
+    if zone:
+        if zone in cache.cached_capability(avr, 'zones'):
+            print("Setting receiver zone to {}".format(zone))
+            avr.zone = zone
+        else:
+            print(("That's not a valid zone. Run `rxvc zones'"
+                   "to get a list of them."))
+    else:
+        print(avr.zone)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.pass_context
+def zones(ctx):
+    """List configured zone names for this receiver.
+
+    """
+    print("Configured zones for this receiver are:")
+    for zone in sorted(cache.cached_capability(ctx.obj['avr'], 'zones')):
+        print('* ', zone)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument("scene", required=False)
+@click.pass_context
+def scene(ctx, scene):
+    """See the current receiver scene or set it if passed an argument
+    that is a valid input for the receiver. Note that if it has spaces
+    in it, you should wrap the whole argument in quotes.
+
+    """
+    avr = ctx.obj['avr']
+    if scene:
+        if scene in cache.cached_capability(avr, 'scenes'):
+            print("Setting receiver scene to {}".format(scene))
+            avr.scene = scene
+        else:
+            print(("That's not a valid scene. Run `rxvc scenes'"
+                   "to get a list of them."))
+    else:
+        print(avr.scene)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.pass_context
+def scenes(ctx):
+    """List valid scene names for this receiver.
+
+    These are scenes that can also be passed to the scene command
+    when using it to select a scene.
+
+    """
+    print("Valid scenes for this receiver are:")
+    for scene in sorted(cache.cached_capability(ctx.obj['avr'], 'scenes')):
+        print('* ', scene)
@@ -0,0 +1,56 @@
+"""Commands for the overall status and power state of the receiver."""
+import sys
+import click
+
+from rxvc.commands import CTX_SETTINGS, ON_OFF
+
+STATUS_TEMPLATE = ("\nPower: %s\n"
+                   "Input: %s\n"
+                   "Volume: %s\n"
+                   "Muted: %s\n\n")
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.pass_context
+def status(ctx):
+    """Print overall status of the receiver."""
+    avr = ctx.obj['avr']
+    status = avr.basic_status
+    sys.stdout.write(STATUS_TEMPLATE % (
+        status.on, status.input, status.volume, status.mute))
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument('state', required=False)
+@click.pass_context
+def power(ctx, state):
+    """Power the receiver on or off. If an argument is passed it
+    should be 'on' or 'off', otherwise just print the current
+    power state.
+
+    Note that RX-V receivers have a Network Standby setting that
+    allows you to turn it on over the wire when the receiver is
+    off, but by default this is not enabled. Make sure you turn
+    that on!
+
+    """
+    avr = ctx.obj['avr']
+    if state:
+        state = state.lower()
+        if state in ON_OFF:
+            try:
+                avr.on = state == 'on'
+                click.echo("Turned the receiver {}".format(state))
+            except:
+                msg = (
+                    "Something went wrong. Make sure the Network "
+                    "Standby setting of your receiver is on."
+                )
+                click.echo(click.style(msg, fg='red'))
+        else:
+            click.echo(
+                click.style("State must be on or off", fg='red')
+            )
+    else:
+        state = 'on' if avr.on else 'off'
+        click.echo("Power state is {}".format(state))
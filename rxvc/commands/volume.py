@@ -0,0 +1,217 @@
+"""Commands for controlling the receiver volume."""
+import click
+
+from rxvc.commands import CTX_SETTINGS
+
+
+# This command a little inconsistent with the input command in that
+# setting the volume requires you pass an option rather than an
+# argument. This is a limitation imposed by click. While with an
+# option with the float type we can pass a negative number in,
+# if we do this with an argument it tries to parse it as an option.
+@click.command(context_settings=CTX_SETTINGS)
+@click.option('-v', '--vol', type=click.FLOAT, required=False)
+@click.pass_context
+def volume(ctx, vol):
+    """Show the current receiver volume level, or set it with the
+    -v/--vol option.
+
+    """
+    from rxv.exceptions import ResponseException
+
+    avr = ctx.obj['avr']
+    if vol is not None:
+        if vol < 0.0:
+            try:
+                avr.volume = vol
+                # rxv truncates the level to a 0.5 step when sending it
+                click.echo(int(vol * 2) / 2.0)
+            except ResponseException as e:
+                if "Volume" in str(e):
+                    msg = "Volume must be specified in -0.5 increments."
+                    err = click.style(msg, fg='red')
+                    click.echo(err, err=True)
+        else:
+            print("Volume must be specified as a negative float in "
+                   "steps of 0.5.")
+    else:
+        click.echo(avr.volume)
+
+
+# This command controls the mute function of the receiver and returns
+# the current state if no argument is provided.
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument('mute', required=False)
+@click.pass_context
+def mute(ctx, mute):
+    """Mute the audio output or return the status. If an argument is
+    passed it should be 'on' or 'off', otherwise the current status
+    is returned.
+
+    """
+    from rxv.exceptions import ResponseException
+
+    avr = ctx.obj['avr']
+    if mute:
+        mute = mute.lower()
+        try:
+            avr.mute = mute == 'on'
+            click.echo(mute)
+        except ResponseException as e:
+            if "Mute" in str(e):
+                msg = "Mute command failed."
+                err = click.style(msg, fg='red')
+                click.echo(err, err=True)
+    else:
+        status = avr.basic_status
+        print(("Muted: {muted}").format(
+                   muted=status.mute))
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.option('-v', '--vol', type=click.FLOAT, required=False)
+@click.argument('delay', type=click.FLOAT, default=0.5, required=False)
+@click.pass_context
+def fade(ctx, vol, delay):
+    """Fade to a given volume with an optional delay between
+    increments. The delay can be specified in seconds.
+
+    """
+    from rxv.exceptions import ResponseException
+
+    avr = ctx.obj['avr']
+    if vol is not None and vol < 0.0:
+        try:
+            print("Fading receiver volume to {0} with delay of {1} seconds".format(vol, delay))
+            _volume_fade(avr, int(vol), delay)
+        except ResponseException as e:
+            print(e)
+            if "Volume" in str(e):
+                msg = "Volume must be specified in -0.5 increments."
+                err = click.style(msg, fg='red')
+                click.echo(err, err=True)
+    else:
+        print("Volume must be specified as a negative float in "
+               "steps of 0.5. Optionally, a delay can be "
+               "specified in seconds.")
+
+
+def _volume_fade(avr, final_vol, delay):
+    """Step the volume from its current level to final_vol in the
+    same 1 dB steps as rxv's volume_fade, but without waiting for the
+    receiver to answer one step before timing the next one.
+
+    Each level is handed to a single worker thread, so the writes
+    still reach the receiver in order while this thread just sleeps
+    delay seconds between steps. If a write fails the remaining ones
+    are cancelled and its exception is raised here.
+
+    """
+    import math
+    import time
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    start_vol = int(math.floor(avr.volume))
+    step = 1 if final_vol > start_vol else -1
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = deque()
+        try:
+            for val in range(start_vol, final_vol + step, step):
+                while pending and pending[0].done():
+                    pending.popleft().result()
+                pending.append(executor.submit(setattr, avr, 'volume', val))
+                time.sleep(delay)
+
+            while pending:
+                pending.popleft().result()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+
+
+# Volume inc/dev convenience commands.
+
+def _adjust_volume(avr, delta):
+    """Adjust volume up or down by adding delta to the current
+    volume level, printing an out of range (best guess) if the
+    receiver complains about the new level.
+
+    The delta should be the number of points multiplied by 0.5,
+    negated when turning the volume down.
+
+    Runs that overlap are coalesced: if another run is already
+    adjusting the volume, delta is handed to it and this one returns
+    without touching the receiver.
+
+    """
+    from rxv.exceptions import ResponseException
+    import rxvc.pending as pending
+
+    if pending.queue(delta):
+        click.echo("Added {} to the volume change in progress.".format(delta))
+        return
+
+    with pending.leading():
+        try:
+            new_vol = avr.volume
+            while True:
+                new_vol += pending.collect()
+                avr.volume = new_vol
+                if not pending.finish():
+                    break
+        except BaseException as e:
+            # Don't leave deltas queued for this burst to be applied
+            # by some later, unrelated run.
+            dropped = pending.abandon()
+            if isinstance(e, ResponseException):
+                click.echo(
+                    click.style("New volume must be out of range.",
+                                fg='red')
+                )
+            if dropped:
+                click.echo("Dropped {} of queued volume changes.".format(
+                    dropped), err=True)
+            if not isinstance(e, ResponseException):
+                raise
+            return
+
+    click.echo(new_vol)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument('points',
+                type=click.INT,
+                default=2,
+                required=False)
+@click.pass_context
+def up(ctx, points):
+    """Turn up the receiver volume in 0.5 increments. If no
+    argument is passed, the argument defaults to 2 which is
+    multiplied by 0.5 (the receiver's accepted increments)
+    and added to current volume. If the argument is passed,
+    you can control the number of increments.
+
+    """
+    avr = ctx.obj['avr']
+    _adjust_volume(avr, points * 0.5)
+
+
+@click.command(context_settings=CTX_SETTINGS)
+@click.argument('points',
+                type=click.INT,
+                default=2,
+                required=False)
+@click.pass_context
+def down(ctx, points):
+    """Turn down the receiver volume in 0.5 increments. If no
+    argument is passed, the argument defaults to 2 which is
+    multiplied by 0.5 (the receiver's accepted increments)
+    and subtracted to current volume. If the argument is passed,
+    you can control the number of increments.
+
+    """
+    avr = ctx.obj['avr']
+    _adjust_volume(avr, -points * 0.5)
@@ -0,0 +1,212 @@
+"""Functions for coalescing bursts of volume adjustments.
+
+Every up/down run drops its delta into the pending directory as a
+file of its own and then tries to create the leader file. The run
+that creates it applies every queued delta with one volume write,
+and writes again only if other runs queued more in the meantime.
+Runs that find a leader already there exit without talking to the
+receiver, leaving their delta for the leader.
+
+Only exclusive file creation and renames are used, both of which
+are atomic on every platform, so no file locking is needed.
+
+"""
+import os
+import signal
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from os.path import expanduser
+
+pending_dir = Path(expanduser("~/.rxvc_pending"))
+leader_path = pending_dir / "leader"
+
+# A leader stamp or delta older than this many seconds was left by a
+# run that died. A live leader refreshes its stamp before each round
+# of a GET and a PUT, each of which rxv lets take up to 10 seconds,
+# so this has to be comfortably longer than 20.
+STALE = 30.0
+
+# The stamp this process wrote to leader_path while it's leading.
+_stamp = None
+
+
+def _create(path, text):
+    """Create path exclusively, readable only by us, containing
+    text. Raises FileExistsError if it's already there.
+
+    """
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as created:
+        created.write(text)
+
+
+def _read_stamp():
+    """Return the stamp in leader_path, or None if there is none or
+    its leader is still writing it.
+
+    """
+    try:
+        return leader_path.read_text() or None
+    except OSError:
+        return None
+
+
+def _write_stamp():
+    """Replace leader_path with a fresh stamp of our own."""
+    global _stamp
+    stamp = repr(time.time())
+    partial = pending_dir / "leader-{}.partial".format(os.getpid())
+    _create(partial, stamp)
+    os.replace(str(partial), str(leader_path))
+    _stamp = stamp
+
+
+def _purge():
+    """Remove deltas older than STALE, queued for a leader that died
+    before collecting them.
+
+    """
+    for path in pending_dir.glob("*.delta"):
+        try:
+            if time.time() - path.stat().st_mtime >= STALE:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def _acquire():
+    """Try to become the leader, taking over from a stale one, and
+    return whether we did.
+
+    """
+    global _stamp
+    for _ in range(2):
+        stamp = repr(time.time())
+        try:
+            # The leader file holds the time it was last stamped, since
+            # unlike its mtime nothing but the leader can change that.
+            _create(leader_path, stamp)
+        except FileExistsError:
+            current = _read_stamp()
+            if current is None:
+                # Gone already, or its leader is still writing it.
+                continue
+            if time.time() - float(current) < STALE:
+                return False
+            # Only remove it if it wasn't re-stamped meanwhile.
+            if _read_stamp() == current:
+                try:
+                    leader_path.unlink()
+                except OSError:
+                    pass
+            continue
+        _stamp = stamp
+        _purge()
+        return True
+    return False
+
+
+def queue(delta):
+    """Queue delta and return True if another run is leading and
+    will apply it. Otherwise return False, in which case the caller
+    is now the leader and must apply the total from collect.
+
+    """
+    pending_dir.mkdir(mode=0o700, exist_ok=True)
+    name = "{}-{}".format(os.getpid(), time.time())
+    partial = pending_dir / (name + ".partial")
+    _create(partial, repr(delta))
+    os.rename(str(partial), str(pending_dir / (name + ".delta")))
+    return not _acquire()
+
+
+def collect():
+    """Claim every queued delta and return their sum. The leader
+    calls this before each round, so it also refreshes our stamp.
+
+    """
+    if _stamp is not None and _read_stamp() == _stamp:
+        try:
+            _write_stamp()
+        except OSError:
+            # e.g. another run reading it on Windows. The old stamp
+            # still has most of STALE left, so try again next round.
+            pass
+
+    claimed = pending_dir / "{}.claimed".format(os.getpid())
+    total = 0.0
+    for path in pending_dir.glob("*.delta"):
+        try:
+            os.rename(str(path), str(claimed))
+        except FileNotFoundError:
+            # Another leader claimed it first.
+            continue
+        try:
+            total += float(claimed.read_text())
+        finally:
+            claimed.unlink()
+    return total
+
+
+def release():
+    """Stop leading, if we are. The leader file is only removed if
+    it still holds our stamp, so it's never one a later leader took
+    over and wrote.
+
+    """
+    global _stamp
+    if _stamp is not None:
+        if _read_stamp() == _stamp:
+            try:
+                leader_path.unlink()
+            except OSError:
+                pass
+        _stamp = None
+
+
+def abandon():
+    """Stop leading after a failure, discarding every delta queued
+    for us, and return the sum of the ones discarded. Deltas queued
+    by runs that saw us leading right up to the end are discarded
+    too, so no later run applies them.
+
+    """
+    dropped = collect()
+    release()
+    while any(pending_dir.glob("*.delta")) and _acquire():
+        dropped += collect()
+        release()
+    return dropped
+
+
+def finish():
+    """Stop leading, unless deltas were queued since the last
+    collect by runs that saw us still leading. In that case take
+    the lead back, if no one else has, and return True so the
+    caller collects and applies them too.
+
+    """
+    release()
+    return any(pending_dir.glob("*.delta")) and _acquire()
+
+
+@contextmanager
+def leading():
+    """Release the lead when the block exits, including when the
+    run is terminated with SIGTERM or SIGHUP. A run killed outright
+    leaves a leader file that turns stale after STALE seconds.
+
+    """
+    def terminate(signum, frame):
+        raise SystemExit(128 + signum)
+
+    signums = [getattr(signal, name) for name in ('SIGTERM', 'SIGHUP')
+               if hasattr(signal, name)]
+    previous = [signal.signal(signum, terminate) for signum in signums]
+    try:
+        yield
+    finally:
+        release()
+        for signum, handler in zip(signums, previous):
+            signal.signal(signum, handler)